@@ -1,6 +1,7 @@
 """A simple permission parsing library.
 
-The main function for permission checking is :func:`pwh_permissions.permitted`.
+The main function for permission checking is :func:`pwh_permissions.permitted`. To find out why a permission
+check failed, pass ``explain=True`` to get the decision tree returned alongside the result.
 
 The permission language is structured as follows:
 
@@ -27,6 +28,7 @@ Examples::
 import re
 
 from inspect import signature
+from time import perf_counter
 
 
 class PermissionException(Exception):
@@ -127,6 +129,32 @@ def parse(tokens):
     return result
 
 
+def check_parameters(instruction, attr, params):
+    """Check whether the number of ``params`` matches the signature of ``attr``, raising a
+    :class:`~pwh_permissions.PermissionException` if it does not.
+
+    :param instruction: The call instruction that ``attr`` and ``params`` were taken from
+    :type instruction: ``tuple``
+    :param attr: The method that was called
+    :type attr: ``callable``
+    :param params: The parameters the method was called with
+    :type params: ``list``
+    """
+    sig = signature(attr)
+    min_count = len([param for param in sig.parameters.values() if param.default == param.empty])
+    max_count = len(sig.parameters)
+    if len(params) < min_count:
+        raise PermissionException('Too few parameters for method "{0}" on "{1}"'.format(
+            instruction[1],
+            instruction[0],
+        ))
+    elif len(params) > max_count:
+        raise PermissionException('Too many parameters for method "{0}" on "{1}"'.format(
+            instruction[1],
+            instruction[0],
+        ))
+
+
 def evaluate(instructions, values):
     """Evaluate the ``instructions``, substituting values from ``values``.
 
@@ -155,19 +183,7 @@ def evaluate(instructions, values):
                 try:
                     stack.append(attr(*params) is True)
                 except TypeError:
-                    sig = signature(attr)
-                    min_count = len([param for param in sig.parameters.values() if param.default == param.empty])
-                    max_count = len(sig.parameters)
-                    if len(params) < min_count:
-                        raise PermissionException('Too few parameters for method "{0}" on "{1}"'.format(
-                            instruction[1],
-                            instruction[0],
-                        ))
-                    elif len(params) > max_count:
-                        raise PermissionException('Too many parameters for method "{0}" on "{1}"'.format(
-                            instruction[1],
-                            instruction[0],
-                        ))
+                    check_parameters(instruction, attr, params)
         else:
             if len(stack) == 0:
                 raise PermissionException('Missing expression for boolean operator')
@@ -182,14 +198,80 @@ def evaluate(instructions, values):
     return stack.pop()
 
 
-def permitted(expression, values):
+def evaluate_explained(instructions, values):
+    """Evaluate the ``instructions`` like :func:`~pwh_permissions.evaluate`, but also record the decision tree.
+
+    Each call in the decision tree is recorded as a ``dict`` with the keys ``'object'``, ``'method'``, ``'params'``,
+    ``'result'``, and ``'time'`` (in seconds). Each boolean operator is recorded as a ``dict`` with the keys
+    ``'operator'``, ``'operands'``, ``'result'``, and ``'time'``, where ``'operands'`` is the list of the two
+    operand nodes in expression order.
+
+    This is slower than :func:`~pwh_permissions.evaluate` and intended for debugging individual checks.
+
+    :param instructions: The postfix instruction list produced by :func:`~pwh_permissions.parse`
+    :type instructions: ``list``
+    :param values: The values to substitute into the ``instructions`` when evaluating
+    :type values: ``dict``
+    :return: The result of evaluating the ``instructions`` and the root of the decision tree
+    :rtype: ``tuple`` of ``bool`` and ``dict`` (``None`` if the ``instructions`` are empty)
+    """
+    if not instructions:
+        return False, None
+    stack = []
+    for instruction in instructions:
+        if isinstance(instruction, tuple):
+            if instruction[0] not in values:
+                raise PermissionException('Object "{0}" not found in the values'.format(instruction[0]))
+            start = perf_counter()
+            obj = values[instruction[0]]
+            params = [values[param] if param in values else param for param in instruction[2:]]
+            node = {'object': instruction[0],
+                    'method': instruction[1] if len(instruction) > 1 else None,
+                    'params': params}
+            if not obj:
+                result = False
+            else:
+                if not hasattr(obj, instruction[1]):
+                    raise PermissionException('Object "{0}" has no method "{1}"'.format(instruction[0], instruction[1]))
+                attr = getattr(obj, instruction[1])
+                try:
+                    result = attr(*params) is True
+                except TypeError:
+                    check_parameters(instruction, attr, params)
+                    raise
+            node['result'] = result
+            node['time'] = perf_counter() - start
+            stack.append(node)
+        else:
+            if len(stack) < 2:
+                raise PermissionException('Missing expression for boolean operator')
+            a = stack.pop()
+            b = stack.pop()
+            if instruction == 'and':
+                result = a['result'] and b['result']
+            elif instruction == 'or':
+                result = a['result'] or b['result']
+            stack.append({'operator': instruction,
+                          'operands': [b, a],
+                          'result': result,
+                          'time': a['time'] + b['time']})
+    node = stack.pop()
+    return node['result'], node
+
+
+def permitted(expression, values, explain=False):
     """Evaluate the ``expression``, substituting values from ``values``.
 
     :param expression: The expression to check
     :type instructions: ``str``
     :param values: The values to substitute into the ``instructions`` when evaluating
     :type values: ``dict``
+    :param explain: Whether to evaluate using :func:`~pwh_permissions.evaluate_explained` and also return the
+                    decision tree
+    :type explain: ``bool``
     :return: The result of evaluating the ``expression``
-    :rtype: ``bool``
+    :rtype: ``bool`` or, if ``explain`` is set, ``tuple`` of ``bool`` and ``dict``
     """
+    if explain:
+        return evaluate_explained(parse(tokenise(expression)), values)
     return evaluate(parse(tokenise(expression)), values)
@@ -2,7 +2,7 @@ from decorator import decorator
 from functools import lru_cache
 from pwh_pyramid_routes import encode_route
 from pyramid.httpexceptions import HTTPForbidden, HTTPFound
-from pwh_permissions import parse, tokenise, evaluate
+from pwh_permissions import parse, tokenise, evaluate, evaluate_explained
 from re import compile
 
 
@@ -31,30 +31,40 @@ def process_permission(permission):
     return instructions, values
 
 
-def check_permission(request, instructions, base_values):
+def check_permission(request, instructions, base_values, explain=False):
     """Checks the permission ``instructions``, substituting the ``base_values`` with data taken from the
-    ``request``."""
+    ``request``. If ``explain`` is set, returns the result together with the decision tree."""
     values = {}
     for key, value in base_values.items():
         if isinstance(value, tuple):
             values[key] = request.dbsession.query(value[0]).filter(getattr(value[0], value[1]) == request.matchdict[value[2]]).first()
         elif value == 'current_user':
             values[key] = request.current_user
+    if explain:
+        return evaluate_explained(instructions, values)
     return evaluate(instructions, values)
 
 
-def permitted(request, permission):
-    """Jinja2 filter that checks if the current user has a specific permission."""
-    return check_permission(request, *process_permission(permission))
+def permitted(request, permission, explain=False):
+    """Jinja2 filter that checks if the current user has a specific permission. If ``explain`` is set, returns the
+    result together with the decision tree."""
+    return check_permission(request, *process_permission(permission), explain=explain)
 
 
-def require_permission(permission):
-    """Pyramid decorator to check permissions for a request."""
+def require_permission(permission, explain=False):
+    """Pyramid decorator to check permissions for a request.
+
+    If ``explain`` is set or the request has a truthy ``explain_permissions`` attribute, the check is run in explain
+    mode and the decision tree is stored in the request's ``permission_explanation`` attribute."""
     instructions, values = process_permission(permission)
 
     def handler(f, *args, **kwargs):
         request = args[0]
-        if check_permission(request, instructions, values):
+        if explain or getattr(request, 'explain_permissions', False):
+            result, request.permission_explanation = check_permission(request, instructions, values, explain=True)
+        else:
+            result = check_permission(request, instructions, values)
+        if result:
             return f(*args, **kwargs)
         elif request.current_user:
             raise HTTPForbidden()
@@ -0,0 +1,116 @@
+import pytest
+
+from timeit import repeat
+
+from pwh_permissions import tokenise, parse, evaluate, evaluate_explained, permitted, PermissionException
+
+
+class ExampleObject(object):
+
+    def allow(self, user, action):
+        """Checks whether the given user is allowed the action. The "view" action is always allowed, the "edit" action
+        only if the is_allowed flag is set on the user."""
+        if action == 'view':
+            return True
+        elif action == 'edit':
+            if user.is_allowed:
+                return True
+            else:
+                return False
+
+
+class ExampleUser(object):
+    """A configurable example user that has an is_allowed marker and a role."""
+
+    def __init__(self, is_allowed, role):
+        self.is_allowed = is_allowed
+        self.role = role
+
+    def has_role(self, role):
+        """Test whether the initialised role is the same as the role parameter."""
+        if role == self.role:
+            return True
+        else:
+            return False
+
+
+def test_empty_explained():
+    """Test explaining an empty expression."""
+    result, tree = evaluate_explained(parse(tokenise('')), {})
+    assert result is False
+    assert tree is None
+
+
+def test_basic_explained():
+    """Test explaining a basic single expression."""
+    user = ExampleUser(False, 'admin')
+    result, tree = evaluate_explained(parse(tokenise('obj allow user edit')), {'obj': ExampleObject(), 'user': user})
+    assert result is False
+    assert tree['object'] == 'obj'
+    assert tree['method'] == 'allow'
+    assert tree['params'] == [user, 'edit']
+    assert tree['result'] is False
+    assert tree['time'] >= 0
+
+
+def test_nested_explained():
+    """Test that the decision tree shows which call failed."""
+    instructions = parse(tokenise('user has_role admin and (obj allow user edit or obj allow user view)'))
+    result, tree = evaluate_explained(instructions, {'obj': ExampleObject(), 'user': ExampleUser(False, 'editor')})
+    assert result is False
+    assert tree['operator'] == 'and'
+    assert tree['result'] is False
+    left, right = tree['operands']
+    assert left['method'] == 'has_role'
+    assert left['result'] is False
+    assert right['operator'] == 'or'
+    assert right['result'] is True
+    assert [node['result'] for node in right['operands']] == [False, True]
+    assert [node['params'][1] for node in right['operands']] == ['edit', 'view']
+
+
+def test_explained_matches_evaluate():
+    """Test that the explained result is the same as the evaluated result."""
+    instructions = parse(tokenise('obj allow user edit or user has_role admin'))
+    for is_allowed in (True, False):
+        for role in ('admin', 'superuser'):
+            values = {'obj': ExampleObject(), 'user': ExampleUser(is_allowed, role)}
+            assert evaluate_explained(instructions, values)[0] == evaluate(instructions, values)
+
+
+def test_none_object_explained():
+    """Test explaining a call on a None object."""
+    result, tree = evaluate_explained(parse(tokenise('obj allow user edit')), {'obj': None, 'user': None})
+    assert result is False
+    assert tree['result'] is False
+
+
+def test_explained_errors():
+    """Test that explaining raises the same errors as evaluating."""
+    with pytest.raises(PermissionException) as e_info:
+        evaluate_explained(parse(tokenise('obj allow user edit')), {})
+    assert e_info.value.message == 'Object "obj" not found in the values'
+    with pytest.raises(PermissionException) as e_info:
+        evaluate_explained(parse(tokenise('obj deny user edit')), {'obj': ExampleObject()})
+    assert e_info.value.message == 'Object "obj" has no method "deny"'
+    with pytest.raises(PermissionException) as e_info:
+        evaluate_explained(parse(tokenise('obj allow user')), {'obj': ExampleObject(), 'user': None})
+    assert e_info.value.message == 'Too few parameters for method "allow" on "obj"'
+
+
+def test_permitted_explain():
+    """Test that permitted returns the decision tree in explain mode."""
+    values = {'obj': ExampleObject(), 'user': ExampleUser(True, 'admin')}
+    assert permitted('obj allow user edit', values) is True
+    result, tree = permitted('obj allow user edit', values, explain=True)
+    assert result is True
+    assert tree['method'] == 'allow'
+
+
+def test_evaluate_has_no_tracing_overhead():
+    """Benchmark that the default evaluation path does not pay for the decision tracing."""
+    instructions = parse(tokenise('user has_role admin and (obj allow user edit or obj allow user view)'))
+    values = {'obj': ExampleObject(), 'user': ExampleUser(True, 'admin')}
+    plain = min(repeat(lambda: evaluate(instructions, values), number=2000, repeat=5))
+    explained = min(repeat(lambda: evaluate_explained(instructions, values), number=2000, repeat=5))
+    assert plain < explained